@@ -1,11 +1,37 @@
+import csv
+import hashlib
+from collections import Counter
 import json
 import os
+import re
 from datetime import datetime
 import matplotlib.pyplot as plt
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 
 DATA_FILE = "budgeting_data.json"
+IMPORT_BATCH_SIZE = 500
+
+# Bank statement headers we recognise for each expense field (matched case-insensitively)
+STATEMENT_COLUMNS = {
+    "name": ["name", "description", "narration", "details", "payee", "merchant"],
+    "amount": ["amount", "debit", "withdrawal", "withdrawal amt.", "debit amount"],
+    "date_time": ["date_time", "date", "transaction date", "txn date", "value date"],
+    "category": ["category"],
+    "type": ["type", "dr/cr", "cr/dr", "transaction type"],
+}
+
+# Values of the type column that mark money coming in rather than an expense
+CREDIT_MARKERS = ("cr", "credit", "deposit")
+
+# Keyword rules used to guess a category when the statement doesn't have one.
+# Keywords are matched against whole words of the transaction name.
+CATEGORY_RULES = [
+    ("Food", ["swiggy", "zomato", "restaurant", "cafe", "grocery", "groceries", "pizza", "food", "bakery"]),
+    ("Utility Bills", ["electricity", "water", "gas", "broadband", "internet", "mobile", "recharge", "bill", "bills"]),
+    ("Transport", ["uber", "ola", "metro", "fuel", "petrol", "diesel", "railway", "irctc", "taxi", "bus"]),
+    ("Shopping", ["amazon", "flipkart", "myntra", "store", "mart", "mall", "shop", "shopping"]),
+]
 
 class User:
     def __init__(self, username, password, budget=0, expenses=None, currency="INR"):
@@ -130,6 +156,123 @@ class User:
         plt.xticks(rotation=45)
         plt.show()
 
+def map_category(name):
+    # Pick the first category with a keyword among the words of the transaction name
+    words = set(re.findall(r"[a-z]+", name.lower()))
+    for category, keywords in CATEGORY_RULES:
+        if words.intersection(keywords):
+            return category
+    return "Misc"
+
+def expense_hash(expense):
+    key = f"{expense['name'].strip().lower()}|{float(expense['amount']):.2f}|{expense.get('date_time', '')}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+def find_statement_columns(fieldnames):
+    headers = {field.strip().lower(): field for field in fieldnames if field}
+    columns = {}
+    for target, candidates in STATEMENT_COLUMNS.items():
+        for candidate in candidates:
+            if candidate in headers:
+                columns[target] = headers[candidate]
+                break
+    return columns
+
+def parse_statement_amount(value):
+    value = (value or "").replace(",", "").strip()
+    if not value:
+        return None
+    return float(value)
+
+def has_negative_amounts(file_name, column):
+    # A single "Amount" column holding negative values is signed: debits are
+    # negative and credits positive. This is a separate streaming pass.
+    with open(file_name, mode="r", newline="", encoding="utf-8-sig") as csvfile:
+        for row in csv.DictReader(csvfile):
+            try:
+                amount = parse_statement_amount(row.get(column))
+            except ValueError:
+                continue
+            if amount is not None and amount < 0:
+                return True
+    return False
+
+def read_statement_rows(file_name):
+    # Yield one expense dict per usable row so large statements are never loaded whole.
+    # Rows with no name or an amount we can't read yield None so they can be counted.
+    with open(file_name, mode="r", newline="", encoding="utf-8-sig") as csvfile:
+        reader = csv.DictReader(csvfile)
+        columns = find_statement_columns(reader.fieldnames or [])
+        if "name" not in columns or "amount" not in columns:
+            raise ValueError("Statement needs a description/name column and an amount/debit column.")
+        signed = columns["amount"].strip().lower() == "amount" and has_negative_amounts(file_name, columns["amount"])
+
+        for row in reader:
+            name = (row.get(columns["name"]) or "").strip()
+            try:
+                amount = parse_statement_amount(row.get(columns["amount"]))
+            except ValueError:
+                yield None
+                continue
+            if amount is None:
+                continue
+            if not name:
+                yield None
+                continue
+            if "type" in columns and (row.get(columns["type"]) or "").strip().lower().startswith(CREDIT_MARKERS):
+                continue
+            if signed:
+                # Positive rows are credits (salary, refunds), not expenses
+                if amount >= 0:
+                    continue
+                amount = -amount
+            elif amount <= 0:
+                continue
+
+            category = ""
+            if "category" in columns:
+                category = (row.get(columns["category"]) or "").strip()
+            expense = {"name": name, "amount": amount, "category": category or map_category(name)}
+
+            if "date_time" in columns:
+                date_time = (row.get(columns["date_time"]) or "").strip()
+                if date_time:
+                    expense["date_time"] = date_time
+            yield expense
+
+def import_statement(users, user, file_name, batch_size=IMPORT_BATCH_SIZE):
+    # Count existing copies so identical purchases within one statement are
+    # only skipped as often as they already appear in the user's expenses
+    existing = Counter(expense_hash(expense) for expense in user.expenses)
+    imported = 0
+    skipped = 0
+    rejected = 0
+    batch = []
+
+    for expense in read_statement_rows(file_name):
+        if expense is None:
+            rejected += 1
+            continue
+        digest = expense_hash(expense)
+        if existing[digest] > 0:
+            existing[digest] -= 1
+            skipped += 1
+            continue
+        batch.append(expense)
+
+        if len(batch) >= batch_size:
+            user.expenses.extend(batch)
+            save_data(users)
+            imported += len(batch)
+            batch = []
+
+    if batch:
+        user.expenses.extend(batch)
+        save_data(users)
+        imported += len(batch)
+
+    return imported, skipped, rejected
+
 def save_data(users):
     data = {username: vars(user) for username, user in users.items()}
     with open(DATA_FILE, "w") as f:
@@ -178,6 +321,7 @@ def main():
             print("7. Plot Expenses")
             print("8. Logout")
             print("9. Help")
+            print("10. Import Bank Statement")
 
             choice = input("Choose an option: ").strip()
 
@@ -232,6 +376,19 @@ def main():
                 print("6. Clear Budget Data: Clear all budget data.")
                 print("7. Plot Expenses: Visualize your expenses with different types of charts.")
                 print("8. Logout: Log out of the current session.")
+                print("10. Import Bank Statement: Import expenses from a bank statement CSV file.")
+            elif choice == "10":
+                file_name = input("Enter the path to the statement CSV file: ").strip()
+                try:
+                    imported, skipped, rejected = import_statement(users, current_user, file_name)
+                except (OSError, ValueError) as e:
+                    print(f"Could not import statement: {e}")
+                else:
+                    print(f"Imported {imported} expenses, skipped {skipped} duplicates.")
+                    if rejected:
+                        print(f"{rejected} rows could not be read (missing name or unrecognised amount) and were not imported.")
+                    if imported:
+                        current_user.advanced_ai_suggestions()
             else:
                 print("Invalid option. Please try again.")
         else:
@@ -3,29 +3,284 @@ CLI Based Habit Tracker
 """
 
 from pathlib import Path
+from contextlib import contextmanager
+import base64
+import bisect
 import json
-from datetime import date, datetime
+import os
+from datetime import date, datetime, timedelta
 import sys
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 DATA_FILE = Path("habits.json")
+LOG_FILE = Path("habits.log")
+LOCK_FILE = Path("habits.lock")
+STORAGE_MODE = "log"  # "log" (append-only log + snapshots) or "json" (rewrite DATA_FILE on every change)
+SNAPSHOT_EVERY = 500
 GOAL_DAYS = 21
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+# Per-habit stats cache ({key: (day computed, stats)}) and a sorted index of
+# habit keys, so menus don't re-sort or recount every habit on each render.
+_stats_cache = {}
+_key_index = {"habits": None, "keys": []}
+_log_state = {"generation": 0, "offset": 0, "events": 0}
+
+# Check-ins are kept in memory as a bytearray bitmap: bit N is set when the
+# habit was checked in N days after its "created" date. On disk the bitmap is
+# stored base64 encoded; the old list-of-ISO-dates format is migrated on load.
 
 def load_data():
+    try:
+        if STORAGE_MODE == "log":
+            with storage_lock():
+                return load_log_data()
+        return read_snapshot()
+    except (OSError, ValueError) as e:
+        storage_error(e)
+
+def storage_error(e):
+    # Don't carry on with an empty or stale tracker: the next save would wipe the file
+    print(f"Could not read habit data: {e}")
+    print("Fix or move the file named above and try again.")
+    sys.exit(1)
+
+def read_snapshot():
     if not DATA_FILE.exists():
         return {"habits": {}}
     try:
         with DATA_FILE.open("r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {"habits": {}}
+            data = json.load(f)
+        for habit in data.get("habits", {}).values():
+            load_checks(habit)
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"'{DATA_FILE}' is damaged ({e})") from e
+    return data
 
 def save_data(data):
-    with DATA_FILE.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # Write to a temp file and rename over the old one so a crash never leaves half a file
+    tmp = DATA_FILE.with_name(DATA_FILE.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"), default=encode_checks)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, DATA_FILE)
+
+# In "log" storage mode every change is appended to LOG_FILE as one JSON line
+# and DATA_FILE is only a snapshot, rewritten once the log holds SNAPSHOT_EVERY
+# events. The log starts with a header naming the snapshot generation it
+# follows, so a log left over from before a snapshot is never replayed twice.
+# All reads and writes of the two files happen while holding LOCK_FILE.
+
+@contextmanager
+def storage_lock():
+    with LOCK_FILE.open("a+b") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def load_log_data():
+    data = read_snapshot()
+    generation = data.setdefault("generation", 0)
+    if log_generation() != generation:
+        start_log(generation)
+    _log_state.update(generation=generation, offset=0, events=0)
+    read_log(data)
+    return data
+
+def log_generation():
+    if not LOG_FILE.exists():
+        return None
+    with LOG_FILE.open("rb") as f:
+        line = f.readline()
+    try:
+        return json.loads(line)["generation"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+def start_log(generation):
+    tmp = LOG_FILE.with_name(LOG_FILE.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(json.dumps({"op": "header", "generation": generation}).encode("utf-8") + b"\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, LOG_FILE)
+
+def read_log(data):
+    # Apply every complete line after the last offset we read. A trailing line
+    # without a newline is a write cut short by a crash: offset stays before it
+    # so commit() cuts it off before appending. A complete line that won't
+    # parse is also a torn write, and an event that can't be applied (say, a
+    # bad date) is skipped the same way rather than locking the tracker up.
+    with LOG_FILE.open("rb") as f:
+        f.seek(_log_state["offset"])
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            _log_state["offset"] += len(line)
+            try:
+                event = json.loads(line)
+                op = event["op"]
+            except (ValueError, KeyError, TypeError):
+                continue
+            if op != "header":
+                try:
+                    apply_event(data, event)
+                except (ValueError, KeyError, TypeError):
+                    continue
+                _log_state["events"] += 1
+
+def refresh(data):
+    # Pick up changes other processes made since we last looked
+    if log_generation() != _log_state["generation"]:
+        data.clear()
+        data.update(load_log_data())
+        _stats_cache.clear()
+    else:
+        read_log(data)
+
+def sync_data(data):
+    if STORAGE_MODE == "log":
+        try:
+            with storage_lock():
+                refresh(data)
+        except (OSError, ValueError) as e:
+            storage_error(e)
+
+def apply_event(data, event):
+    habits = data["habits"]
+    key = event["key"]
+    if event["op"] == "add":
+        if key not in habits:
+            habit = {"name": event["name"], "created": date.fromisoformat(event["created"]).isoformat(),
+                     "checks": bytearray(), "completed": False}
+            index_add(data, key)
+            habits[key] = habit
+    elif event["op"] == "checkin":
+        habit = habits.get(key)
+        # Check-ins from before the habit was created (e.g. a re-added habit) are ignored
+        if habit is not None and day_index(habit, event["day"]) >= 0 and not has_check(habit, event["day"]):
+            set_check(habit, event["day"])
+            if count_checks(habit) >= GOAL_DAYS:
+                habit["completed"] = True
+            invalidate_stats(key)
+    elif event["op"] == "delete":
+        if key in habits:
+            index_remove(data, key)
+            del habits[key]
+            invalidate_stats(key)
+
+def record(data, event):
+    if STORAGE_MODE != "log":
+        apply_event(data, event)
+        save_data(data)
+        return
+    try:
+        commit(data, event)
+    except (OSError, ValueError) as e:
+        storage_error(e)
+
+def commit(data, event):
+    # Each event is one locked append and one fsync; there is no group commit
+    # across writers. The menu only ever has one change to write, and the
+    # lock is held just long enough to catch up on the log and add one line.
+    with storage_lock():
+        refresh(data)
+        apply_event(data, event)
+        line = json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n"
+        with LOG_FILE.open("r+b") as f:
+            # Drop any torn tail so our line starts on a fresh line
+            f.seek(_log_state["offset"])
+            f.truncate()
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        _log_state["offset"] += len(line)
+        _log_state["events"] += 1
+        if _log_state["events"] >= SNAPSHOT_EVERY:
+            compact(data)
+
+def compact(data):
+    # Called with the lock held: fold the log into a new snapshot and start an empty log
+    generation = _log_state["generation"] + 1
+    data["generation"] = generation
+    save_data(data)
+    start_log(generation)
+    _log_state.update(generation=generation, offset=0, events=0)
+    read_log(data)
 
 def iso_today():
     return date.today().isoformat()
 
+def encode_checks(obj):
+    if isinstance(obj, bytearray):
+        return base64.b64encode(bytes(obj)).decode("ascii")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def load_checks(habit):
+    checks = habit.get("checks", [])
+    if isinstance(checks, str):
+        habit["checks"] = bytearray(base64.b64decode(checks))
+        return
+    # Old format: a list of ISO date strings
+    days = sorted({date.fromisoformat(d) for d in checks})
+    created = date.fromisoformat(habit.get("created") or iso_today())
+    if days and days[0] < created:
+        created = days[0]
+    habit["created"] = created.isoformat()
+    habit["checks"] = bytearray()
+    for d in days:
+        set_check(habit, d.isoformat())
+
+def day_index(habit, day):
+    return date.fromisoformat(day).toordinal() - date.fromisoformat(habit["created"]).toordinal()
+
+def has_check(habit, day):
+    i = day_index(habit, day)
+    bits = habit["checks"]
+    if i < 0 or (i >> 3) >= len(bits):
+        return False
+    return bool(bits[i >> 3] & (1 << (i & 7)))
+
+def set_check(habit, day):
+    i = day_index(habit, day)
+    if i < 0:
+        raise ValueError(f"{day} is before '{habit['name']}' was created")
+    bits = habit["checks"]
+    if (i >> 3) >= len(bits):
+        bits.extend(bytes((i >> 3) + 1 - len(bits)))
+    bits[i >> 3] |= 1 << (i & 7)
+
+def count_checks(habit):
+    return int.from_bytes(habit["checks"], "little").bit_count()
+
+def check_dates(habit):
+    created = date.fromisoformat(habit["created"])
+    value = int.from_bytes(habit["checks"], "little")
+    dates = []
+    i = 0
+    while value:
+        if value & 1:
+            dates.append((created + timedelta(days=i)).isoformat())
+        value >>= 1
+        i += 1
+    return dates
+
 def add_habit(data):
     name = input("Enter new habit name (e.g. 'Meditate'): ").strip()
     if not name:
@@ -37,25 +292,96 @@ def add_habit(data):
         print(f"'{name}' already exists. Try checking in instead.")
         return
 
-    habit = {
-        "name": name,
-        "created": iso_today(),
-        "checks": [],       
-        "completed": False
-    }
-    data["habits"][key] = habit
-    save_data(data)
+    record(data, {"op": "add", "key": key, "name": name, "created": iso_today()})
     print(f"Habit '{name}' added. Go crush those 21 days! 🎯")
 
+def sorted_keys(data):
+    habits = data.get("habits", {})
+    if _key_index["habits"] is not habits or len(_key_index["keys"]) != len(habits):
+        _key_index["habits"] = habits
+        _key_index["keys"] = sorted(habits.keys())
+    return _key_index["keys"]
+
+# index_add/index_remove must run before data["habits"] itself changes, or
+# sorted_keys sees the size mismatch and rebuilds the whole index.
+
+def index_add(data, key):
+    keys = sorted_keys(data)
+    i = bisect.bisect_left(keys, key)
+    if i == len(keys) or keys[i] != key:
+        keys.insert(i, key)
+
+def index_remove(data, key):
+    keys = sorted_keys(data)
+    i = bisect.bisect_left(keys, key)
+    if i < len(keys) and keys[i] == key:
+        del keys[i]
+
+def invalidate_stats(key):
+    _stats_cache.pop(key, None)
+
+def weekday_mask(offset, nbits):
+    # Bits set at positions offset, offset + 7, offset + 14, ... below nbits
+    reps = (nbits - offset + 6) // 7
+    if reps <= 0:
+        return 0
+    return int("0000001" * reps, 2) << offset
+
+def compute_stats(habit, today=None):
+    # All the arithmetic below works on the whole bitmap at once as one big int
+    today = today or iso_today()
+    bits = int.from_bytes(habit["checks"], "little")
+    span = max(day_index(habit, today) + 1, 1)
+    total = bits.bit_count()
+
+    longest = 0
+    run = bits
+    while run:
+        run &= run >> 1
+        longest += 1
+
+    # A streak still counts if today hasn't been checked in yet
+    end = span - 1
+    if not (bits >> end) & 1:
+        end -= 1
+    current = 0
+    if end >= 0 and (bits >> end) & 1:
+        window = (1 << (end + 1)) - 1
+        gaps = ~bits & window
+        current = end + 1 if not gaps else end - (gaps.bit_length() - 1)
+
+    start = date.fromisoformat(habit["created"]).weekday()
+    nbits = max(bits.bit_length(), 1)
+    weekdays = {}
+    for i, name in enumerate(WEEKDAYS):
+        weekdays[name] = (bits & weekday_mask((i - start) % 7, nbits)).bit_count()
+
+    return {
+        "total": total,
+        "current_streak": current,
+        "longest_streak": longest,
+        "completion_rate": total / span,
+        "weekdays": weekdays,
+    }
+
+def habit_stats(data, key):
+    today = iso_today()
+    cached = _stats_cache.get(key)
+    if cached and cached[0] == today:
+        return cached[1]
+    stats = compute_stats(data["habits"][key], today)
+    _stats_cache[key] = (today, stats)
+    return stats
+
 def list_habits(data):
     habits = data.get("habits", {})
     if not habits:
         print("No habits yet — add one from the menu.")
         return []
-    keys = sorted(habits.keys())
+    keys = sorted_keys(data)
     for i, k in enumerate(keys, 1):
         h = habits[k]
-        days = len(h.get("checks", []))
+        days = habit_stats(data, k)["total"]
         status = "✅ Completed" if h.get("completed", False) else f"{days}/{GOAL_DAYS} days"
         print(f"{i}. {h['name']}  —  {status}")
     return keys
@@ -87,28 +413,27 @@ def checkin(data):
         print(f"'{habit['name']}' is already completed. 🎉")
         return
 
-    if today in habit["checks"]:
+    if has_check(habit, today):
         print(f"You already checked in for '{habit['name']}' today. Nice consistency! 💪")
         return
 
-    habit["checks"].append(today)
+    record(data, {"op": "checkin", "key": key, "day": today})
+    habit = data["habits"].get(key, habit)
+    days = count_checks(habit)
 
-    if len(habit["checks"]) >= GOAL_DAYS:
-        habit["completed"] = True
+    if habit["completed"]:
         print(f"🎊 Congrats! You completed '{habit['name']}' — {GOAL_DAYS} days done!")
     else:
-        remaining = GOAL_DAYS - len(habit["checks"])
-        percent = (len(habit["checks"]) / GOAL_DAYS) * 100
-        print(f"Checked in for '{habit['name']}'. Progress: {len(habit['checks'])}/{GOAL_DAYS} ({percent:.1f}%). {remaining} days to go.")
-
-    save_data(data)
+        remaining = GOAL_DAYS - days
+        percent = (days / GOAL_DAYS) * 100
+        print(f"Checked in for '{habit['name']}'. Progress: {days}/{GOAL_DAYS} ({percent:.1f}%). {remaining} days to go.")
 
 def show_details(data):
     key = choose_habit(data)
     if not key:
         return
     h = data["habits"][key]
-    checks = h.get("checks", [])
+    checks = check_dates(h)
     print(f"\nName     : {h['name']}")
     print(f"Created  : {h.get('created')}")
     print(f"Completed: {h.get('completed')}")
@@ -119,6 +444,19 @@ def show_details(data):
         print("Checks   : (none yet)")
     print()
 
+def show_stats(data):
+    keys = sorted_keys(data)
+    if not keys:
+        print("No habits yet — add one from the menu.")
+        return
+    print(f"\n{'Habit':<20} {'Days':>5} {'Streak':>7} {'Best':>5} {'Rate':>7}  Weekdays")
+    for k in keys:
+        st = habit_stats(data, k)
+        week = " ".join(f"{d[:2]}:{n}" for d, n in st["weekdays"].items())
+        print(f"{data['habits'][k]['name'][:20]:<20} {st['total']:>5} {st['current_streak']:>7} "
+              f"{st['longest_streak']:>5} {st['completion_rate'] * 100:>6.1f}%  {week}")
+    print()
+
 def delete_habit(data):
     key = choose_habit(data)
     if not key:
@@ -126,8 +464,7 @@ def delete_habit(data):
     name = data["habits"][key]["name"]
     confirm = input(f"Type 'yes' to delete habit '{name}': ").strip().lower()
     if confirm == "yes":
-        del data["habits"][key]
-        save_data(data)
+        record(data, {"op": "delete", "key": key})
         print(f"Deleted '{name}'.")
     else:
         print("Not deleted.")
@@ -142,11 +479,13 @@ Habit Tracker — 21 Day Challenge
 3) Show habits
 4) Habit details
 5) Delete habit
-6) Exit
+6) Habit stats
+7) Exit
 """
     while True:
         print(menu)
-        choice = input("Pick an option (1-6): ").strip()
+        choice = input("Pick an option (1-7): ").strip()
+        sync_data(data)
         if choice == "1":
             add_habit(data)
         elif choice == "2":
@@ -158,6 +497,8 @@ Habit Tracker — 21 Day Challenge
         elif choice == "5":
             delete_habit(data)
         elif choice == "6":
+            show_stats(data)
+        elif choice == "7":
             print("Stay consistent — you've got this! 👊")
             break
         else:
@@ -1,35 +1,337 @@
+import os
+import sys
 import time
+import json
+import heapq
+import itertools
+import asyncio
 import argparse
-from datetime import timedelta
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
 
+LOG_FILE = Path("timextask_log.jsonl")
+REFRESH = 1.0  # seconds between display updates
+CLEAR_LINE = "\r\x1b[K"  # back to column 0 and erase what the last status line left
 
-def countdown(task_name: str, duration: str):
+
+def parse_duration(duration: str) -> int:
+    parts = duration.strip().split(":")
+    if any(part.strip().startswith("-") for part in parts):
+        raise ValueError(f"Duration '{duration}' can't be negative.")
     try:
-        h, m, s = map(int, duration.split(":"))
-        total_seconds = h * 3600 + m * 60 + s
+        h, m, s = map(int, parts)
     except ValueError:
-        print("Invalid time format. Use HH:MM:SS (e.g. 00:25:00)")
+        raise ValueError(f"Invalid time format '{duration}'. Use HH:MM:SS (e.g. 00:25:00)") from None
+    return h * 3600 + m * 60 + s
+
+
+def fmt(seconds: float) -> str:
+    # Round up so a timer shows 0:00:01 until it actually expires
+    return str(timedelta(seconds=int(-(-seconds // 1))))
+
+
+class Timer:
+    def __init__(self, name: str, total_seconds: int):
+        self.name = name
+        self.total = total_seconds
+        self.started = datetime.now().isoformat(timespec="seconds")
+        self.deadline = time.monotonic() + total_seconds
+        self.remaining = None  # set while paused
+        self.paused_for = 0.0
+        self.paused_at = None
+        self.entry = None  # id of this timer's live heap entry; None while paused
+
+    @property
+    def paused(self):
+        return self.remaining is not None
+
+    def left(self, now: float) -> float:
+        return self.remaining if self.paused else max(self.deadline - now, 0.0)
+
+
+class Scheduler:
+    """Runs many named timers in one asyncio loop.
+
+    Expiry times live in a heap of monotonic deadlines, and the display is
+    refreshed on a fixed monotonic grid, so neither drifts with print time.
+    The loop sleeps until whichever of the two is due first, and only waits
+    for commands while no timer is running.
+    """
+
+    def __init__(self, log_file: Path = LOG_FILE, refresh: float = REFRESH):
+        self.timers = {}
+        self.heap = []
+        self.log_file = log_file
+        self.refresh = refresh
+        self._entry_ids = itertools.count()
+        self._changed = None
+
+    def add(self, name: str, duration: str):
+        if name in self.timers:
+            raise ValueError(f"A timer named '{name}' is already running.")
+        timer = Timer(name, parse_duration(duration))
+        self.timers[name] = timer
+        self._push(timer)
+        self._wake()
+        return timer
+
+    def pause(self, name: str):
+        timer = self.timers[name]
+        if timer.paused:
+            return
+        now = time.monotonic()
+        timer.remaining = timer.left(now)
+        timer.paused_at = now
+        timer.entry = None
+        self._wake()
+
+    def resume(self, name: str):
+        timer = self.timers[name]
+        if not timer.paused:
+            return
+        now = time.monotonic()
+        timer.deadline = now + timer.remaining
+        timer.paused_for += now - timer.paused_at
+        timer.remaining = None
+        timer.paused_at = None
+        self._push(timer)
+        self._wake()
+
+    def cancel(self, name: str):
+        self.timers.pop(name).entry = None
+        self._wake()
+
+    def _push(self, timer: Timer):
+        # Entry ids are unique across all timers, so an entry left behind by a
+        # cancelled timer can never match a new timer with the same name
+        timer.entry = next(self._entry_ids)
+        heapq.heappush(self.heap, (timer.deadline, timer.entry, timer))
+
+    def _wake(self):
+        if self._changed is not None:
+            self._changed.set()
+
+    def _next_deadline(self):
+        # Drop entries for timers that were paused, resumed or cancelled since being pushed
+        while self.heap:
+            deadline, entry, timer = self.heap[0]
+            if timer.entry == entry:
+                return deadline
+            heapq.heappop(self.heap)
+        return None
+
+    def _expire(self, now: float) -> bool:
+        expired = False
+        while True:
+            deadline = self._next_deadline()
+            if deadline is None or deadline > now:
+                return expired
+            _, _, timer = heapq.heappop(self.heap)
+            del self.timers[timer.name]
+            timer.entry = None
+            self.log(timer)
+            print(f"{CLEAR_LINE}✅ Time’s up! Task complete: {timer.name}")
+            expired = True
+
+    def log(self, timer: Timer):
+        entry = {
+            "task": timer.name,
+            "seconds": timer.total,
+            "paused_seconds": round(timer.paused_for, 1),
+            "started": timer.started,
+            "finished": datetime.now().isoformat(timespec="seconds"),
+        }
+        with self.log_file.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def status(self, now: float) -> str:
+        parts = []
+        for name, timer in self.timers.items():
+            state = " (paused)" if timer.paused else ""
+            parts.append(f"{name}: {fmt(timer.left(now))}{state}")
+        return " | ".join(parts)
+
+    async def run(self, until_empty: bool = True):
+        self._changed = asyncio.Event()
+        self._changed.set()  # draw the status line straight away
+        next_refresh = None
+        while self.timers or not until_empty:
+            now = time.monotonic()
+            expired = self._expire(now)
+            if not self.timers and until_empty:
+                break
+
+            due = next_refresh is not None and now >= next_refresh
+            if (due or expired or self._changed.is_set()) and self.timers:
+                print(f"{CLEAR_LINE}Time left: {self.status(now)}", end="", flush=True)
+            if not any(not timer.paused for timer in self.timers.values()):
+                # Nothing is counting down, so there is nothing to redraw until a command arrives
+                next_refresh = None
+            elif next_refresh is None:
+                next_refresh = now + self.refresh
+            elif due:
+                # Stay on the original grid instead of drifting by the print cost
+                next_refresh += self.refresh * (int((now - next_refresh) / self.refresh) + 1)
+
+            wake = next_refresh
+            deadline = self._next_deadline()
+            if deadline is not None:
+                wake = deadline if wake is None else min(wake, deadline)
+            self._changed.clear()
+            if wake is None:
+                await self._changed.wait()
+                continue
+            try:
+                await asyncio.wait_for(self._changed.wait(), max(wake - time.monotonic(), 0))
+            except asyncio.TimeoutError:
+                pass
+
+
+def start_reader(queue: asyncio.Queue):
+    # Blocking reads can't be cancelled, so stdin is read on a daemon thread
+    # that never holds up exit (e.g. after Ctrl-C). It uses os.read rather than
+    # input() so it doesn't hold sys.stdin's lock at interpreter shutdown.
+    # None marks end of input.
+    loop = asyncio.get_running_loop()
+    fd = sys.stdin.fileno()
+
+    def put(line):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, line)
+        except RuntimeError:  # the loop has already closed
+            return False
+        return True
+
+    def read():
+        buffer = b""
+        while True:
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                if buffer:
+                    put(buffer.decode(errors="replace"))
+                put(None)
+                return
+            buffer += chunk
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                if not put(line.decode(errors="replace")):
+                    return
+
+    threading.Thread(target=read, daemon=True).start()
+
+
+async def read_commands(scheduler: Scheduler):
+    print("Commands: add TASK HH:MM:SS | pause TASK | resume TASK | cancel TASK | quit")
+    queue = asyncio.Queue()
+    start_reader(queue)
+    while True:
+        line = await queue.get()
+        if line is None:
+            return
+        line = line.strip()
+        if not line:
+            continue
+        cmd, _, rest = line.partition(" ")
+        try:
+            if cmd == "add":
+                name, _, duration = rest.strip().rpartition(" ")
+                if not name.strip():
+                    print("Usage: add TASK HH:MM:SS")
+                    continue
+                scheduler.add(name.strip(), duration)
+            elif cmd in ("pause", "resume", "cancel"):
+                getattr(scheduler, cmd)(rest.strip())
+            elif cmd == "quit":
+                return
+            else:
+                print("Unknown command.")
+        except KeyError:
+            print(f"No timer named '{rest.strip()}'.")
+        except ValueError as e:
+            print(e)
+
+
+async def interactive(scheduler: Scheduler):
+    runner = asyncio.create_task(scheduler.run(until_empty=False))
+    try:
+        await read_commands(scheduler)
+    finally:
+        runner.cancel()
+
+
+def report(log_file: Path = LOG_FILE):
+    if not log_file.exists():
+        print("No completed tasks logged yet.")
+        return
+    totals = {}
+    with log_file.open("r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                task, seconds = entry["task"], int(entry["seconds"])
+            except (ValueError, KeyError, TypeError):
+                # A torn or hand-edited line; skip it rather than lose the whole report
+                continue
+            count, total = totals.get(task, (0, 0))
+            totals[task] = (count + 1, total + seconds)
+    print("Completed tasks:")
+    for task, (count, seconds) in sorted(totals.items(), key=lambda item: -item[1][1]):
+        print(f"{task}: {count} session(s), {timedelta(seconds=seconds)} total")
+
+
+def countdown(task_name: str, duration: str):
+    scheduler = Scheduler()
+    try:
+        scheduler.add(task_name, duration)
+    except ValueError as e:
+        print(e)
         return
 
     print(f"⏳ Task: {task_name}")
     print(f"Timer set for {duration} (HH:MM:SS)\n")
+    run(scheduler.run())
 
-    while total_seconds > 0:
-        td = str(timedelta(seconds=total_seconds))
-        print(f"\rTime left: {td}", end="", flush=True)
-        time.sleep(1)
-        total_seconds -= 1
 
-    print("\r✅ Time’s up! Task complete:", task_name)
+def run(coro):
+    try:
+        asyncio.run(coro)
+    except KeyboardInterrupt:
+        print("\nTimer stopped.")
 
 
 def main():
     parser = argparse.ArgumentParser(description="Simple CLI Task Timer")
-    parser.add_argument("task", type=str, help="Name of the task")
-    parser.add_argument("duration", type=str, help="Timer in HH:MM:SS format (e.g., 00:25:00)")
+    parser.add_argument("timers", nargs="*", metavar="TASK DURATION",
+                        help="Task name followed by a timer in HH:MM:SS format (e.g., Write 00:25:00); repeat for more timers")
+    parser.add_argument("-i", "--interactive", action="store_true",
+                        help="Keep running and read add/pause/resume commands from the keyboard")
+    parser.add_argument("--report", action="store_true", help="Show a summary of completed tasks and exit")
     args = parser.parse_args()
 
-    countdown(args.task, args.duration)
+    if args.report:
+        report()
+        return
+    if len(args.timers) % 2:
+        parser.error("each task needs a duration in HH:MM:SS format")
+    if len(args.timers) == 2 and not args.interactive:
+        countdown(*args.timers)
+        return
+
+    scheduler = Scheduler()
+    for name, duration in zip(args.timers[::2], args.timers[1::2]):
+        try:
+            scheduler.add(name, duration)
+        except ValueError as e:
+            parser.error(f"{name}: {e}")
+    if args.interactive:
+        run(interactive(scheduler))
+    elif scheduler.timers:
+        run(scheduler.run())
+    else:
+        parser.error("give at least one TASK DURATION pair, or use --interactive")
 
 
 if __name__ == "__main__":